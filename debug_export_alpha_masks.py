@@ -1,6 +1,8 @@
 import configparser
 import os
 
+from pixelation import HARD_ALPHA_LUT
+
 
 def debug_export_alpha_masks(
     source_folder: str, destination_folder: str, fuzzy: bool = False
@@ -21,16 +23,19 @@ def debug_export_alpha_masks(
             try:
                 from PIL import Image
 
-                img = Image.open(file_path).convert("RGBA")
+                img = Image.open(file_path)
+                # Textures exported from the game are usually RGBA already, don't copy them
+                if img.mode != "RGBA":
+                    img = img.convert("RGBA")
             except Exception as e:
                 print(f"Failed to load image {file_name}: {e}")
                 continue
 
             # create a mask from the alpha channel
             try:
-                mask = img.split()[-1]  # Get the alpha channel
+                mask = img.getchannel("A")  # Get the alpha channel
                 if fuzzy:
-                    mask = mask.point(lambda p: 255 if p > 0 else 0)
+                    mask = mask.point(HARD_ALPHA_LUT)
 
             except Exception as e:
                 print(f"Failed to create mask for {file_name}: {e}")
@@ -1,16 +1,299 @@
 import os
+import re
 import sys
 import tkinter as tk
-from tkinter import filedialog, ttk, messagebox, PhotoImage
+from tkinter import filedialog, ttk, messagebox
 import configparser
 from PIL import Image, ImageTk
-from main import pixelate_edition, replace_files
-import gc
 import time
 import threading
+import queue
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+import weakref
+
+
+# Size of the preview label, only this part of the placeholder screenshot is ever visible
+PREVIEW_SIZE = (560, 480)
+
+# Maximum number of generated preview images kept in memory
+PREVIEW_CACHE_SIZE = 64
+
+# Minimum time (in seconds) between two redraws of the status bar and progress bar
+STATUS_FLUSH_INTERVAL = 0.033
+
+# Time (in seconds) a scanned backup list is reused, e.g. when switching editions back and forth
+BACKUP_CACHE_TTL = 5.0
+
+# Interval (in milliseconds) in which calls posted by background threads are run on the Tk thread
+UI_QUEUE_POLL_INTERVAL = 50
+
+# Prefix of the progress messages logged by pixelate_edition,
+# e.g. "[UNOFFICIAL RETRO PATCH] Pixelating texture 1/5: anims1Sprites"
+TEXTURE_PROGRESS_PREFIX = "[UNOFFICIAL RETRO PATCH] Pixelating texture "
+
+# Files shipped in the assets folder, indexed once so looking up bundled assets needs no syscalls
+try:
+    _ASSET_INDEX = frozenset(
+        os.path.normpath(os.path.join(root, file))
+        for root, _, files in os.walk("assets")
+        for file in files
+    )
+except OSError:
+    _ASSET_INDEX = frozenset()
+
+
+def scan_backup_files(folder):
+    """
+    Recursively find the backup files in a folder, e.g. resources.assets.backup001.
+
+    Files are only matched by name, so no file needs to be stat'ed while scanning.
+
+    Args:
+        folder: Path to the folder to search
+
+    Yields:
+        os.DirEntry of each backup file
+    """
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from scan_backup_files(entry.path)
+                elif ".backup" in entry.name:
+                    yield entry
+    except OSError:
+        return  # Unreadable folders are skipped, like os.walk() does
+
+
+def asset_exists(path):
+    """
+    Check if a file exists, using the asset index for paths inside the assets folder.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        bool: True if the file exists
+    """
+    if os.path.normpath(path) in _ASSET_INDEX:
+        return True
+    # Not a (known) bundled asset, e.g. when frozen or added after startup
+    return os.path.exists(path)
+
+
+# Suffix of the backups created by pixelate_edition, e.g. "sharedassets0.assets.backup001"
+BACKUP_SUFFIX_RE = re.compile(r"\.backup\d{3}$")
+
+EDITION_IMAGE_PATHS = {
+    "Stronghold Definitive Edition": "assets/firefly/shde.png",
+    "Stronghold Crusader Definitive Edition": "assets/firefly/shcde.png",
+}
+
+
+# Directory the resized edition thumbnails are persisted in, so they're only resampled once
+THUMBNAIL_CACHE_DIR = os.path.join(
+    os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "urp",
+    "thumbs",
+)
+
+# Edition thumbnails by (edition, size), they are dropped once no button references them anymore
+_EDITION_IMAGE_CACHE = weakref.WeakValueDictionary()
+
+
+def ensure_thumbnail(src_path, size):
+    """
+    Get the path of a resized copy of an image, creating it on first use.
+
+    The modification time of the source is part of the file name, so changed images are resized again.
+
+    Args:
+        src_path: Path to the source image
+        size: Tuple of (width, height) the thumbnail has to fit in
+
+    Returns:
+        Path to the thumbnail PNG, or None if it couldn't be written
+    """
+    name = os.path.splitext(os.path.basename(src_path))[0]
+    mtime = os.stat(src_path).st_mtime_ns
+    thumb_path = os.path.join(THUMBNAIL_CACHE_DIR, f"{name}-{size[0]}x{size[1]}-{mtime}.png")
+    if os.path.exists(thumb_path):
+        return thumb_path
+
+    try:
+        os.makedirs(THUMBNAIL_CACHE_DIR, exist_ok=True)
+        img = Image.open(src_path)
+        # thumbnail() already lets JPEGs decode at a reduced scale (draft with reducing_gap=2),
+        # while keeping enough resolution for LANCZOS to downsample cleanly
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        # Write to a temporary file first, so a half written thumbnail is never picked up
+        tmp_path = f"{thumb_path}.{os.getpid()}.tmp"
+        img.save(tmp_path, "PNG")
+        os.replace(tmp_path, thumb_path)
+    except OSError as e:
+        print(f"Could not cache thumbnail of {src_path}: {e}")
+        return None
+    return thumb_path
+
+
+def load_edition_image(edition, size=(96, 48)):
+    """
+    Load the thumbnail of an edition, shared by every button showing it in the same size.
+
+    Must be called after the Tk root has been created, as PhotoImages are bound to it.
+
+    Args:
+        edition: Name of the edition
+        size: Tuple of (width, height) the thumbnail has to fit in
+
+    Returns:
+        tk.PhotoImage or ImageTk.PhotoImage, or None if the edition has no thumbnail
+    """
+    key = (edition, size)
+    image = _EDITION_IMAGE_CACHE.get(key)
+    if image is None:
+        path = EDITION_IMAGE_PATHS.get(edition)
+        if not path or not asset_exists(path):
+            return None
+        thumb_path = ensure_thumbnail(path, size)
+        if thumb_path:
+            # Already sized, Tk can read it directly without going through PIL
+            image = tk.PhotoImage(file=thumb_path)
+        else:
+            img = Image.open(path)
+            img.thumbnail(size, Image.Resampling.LANCZOS)
+            image = ImageTk.PhotoImage(img)
+        _EDITION_IMAGE_CACHE[key] = image
+    return image
+
+
+def parse_texture_progress(message):
+    """
+    Parse the progress of a texture progress message.
+
+    Args:
+        message: Log message of pixelate_edition
+
+    Returns:
+        Tuple of (current, total), or None if it isn't a texture progress message
+    """
+    if not message.startswith(TEXTURE_PROGRESS_PREFIX):
+        return None
+    progress = message[len(TEXTURE_PROGRESS_PREFIX):].partition(":")[0]
+    current, _, total = progress.partition("/")
+    try:
+        return int(current), int(total)
+    except ValueError:
+        return None
+
+
+def crop_preview_area(image):
+    """
+    Crop a placeholder screenshot to the part that is visible in the preview.
+
+    Args:
+        image: PIL Image object of the placeholder screenshot
+
+    Returns:
+        PIL Image of at most PREVIEW_SIZE
+    """
+    # Make preview square (crop to square center),
+    # the preview label then shows the center of that square
+    width, height = image.size
+    side = min(width, height)
+    left = (width - side) // 1.8
+    top = (height - side) // 2
+    center_x = left + side / 2
+    center_y = top + side / 2
+
+    preview_width = min(PREVIEW_SIZE[0], side)
+    preview_height = min(PREVIEW_SIZE[1], side)
+    left = round(center_x - preview_width / 2)
+    top = round(center_y - preview_height / 2)
+    return image.crop((left, top, left + preview_width, top + preview_height))
+
+
+@lru_cache(maxsize=8)
+def load_placeholder(path):
+    """
+    Load a placeholder screenshot cropped to the preview area, decoded only once per process.
+
+    Args:
+        path: Path to the screenshot
+
+    Returns:
+        Cached PIL Image, callers have to copy it before modifying it
+    """
+    # Only pixelate the visible part of the screenshot, instead of the full resolution
+    return crop_preview_area(Image.open(path))
+
+
+@lru_cache(maxsize=8)
+def load_icon_image(path):
+    """
+    Load an icon or logo as Tk PhotoImage, decoded only once per process.
+
+    Must be called after the Tk root has been created, as PhotoImages are bound to it.
+
+    Args:
+        path: Path to the icon
+
+    Returns:
+        tk.PhotoImage
+    """
+    return tk.PhotoImage(file=path)
+
+
+def preload_backend():
+    """
+    Import the pixelation backend (UnityPy, asset patches, ...) ahead of its first use.
+
+    Runs on a background thread once the window is shown, so starting the GUI doesn't wait for it.
+    Import errors are ignored here, they are reported when applying the pixelation.
+    """
+    try:
+        import main
+
+        main.load_unitypy()
+    except Exception:
+        pass
+
+
+def create_preview_image(image, pixelation_amount, black_shadows):
+    """
+    Generate the preview image for the given settings.
+
+    Runs on a worker thread, so it must not touch any Tk objects.
+
+    Args:
+        image: PIL Image object of the placeholder screenshot, see crop_preview_area()
+        pixelation_amount: Float between 0 and 1
+        black_shadows: Boolean to enable black shadows feature
+
+    Returns:
+        Pixelated PIL Image
+    """
+    # Apply pixelation to the placeholder image
+    from pixelation import pixelate_image
+    pil_img = pixelate_image(image, pixelation_amount)
+
+    # Black shadows only replace semi-transparent pixels, so they can't change screenshots
+    # without transparency, skip the RGBA conversion and the array round-trip for them.
+    # The black shadows feature will be applied to actual game textures.
+    if black_shadows and "A" in pil_img.getbands():
+        from pixelation import apply_black_shadows
+        pil_img = apply_black_shadows(pil_img)
+
+    return pil_img
 
 
 class RetroPixelatorGUI:
+    # Results of validate_game_directory, keyed by (edition, directory, directory mtime)
+    _validation_cache = {}
+
     def __init__(self, root):
         self.root = root
         self.root.title("Unofficial Retro Patch (v1.0.0)")
@@ -32,12 +315,11 @@ class RetroPixelatorGUI:
                     "assets/icon", "urp.ico" if sys.platform == "win32" else "urp.png"
                 )
 
-            if os.path.exists(ico_path):
+            if asset_exists(ico_path):
                 if sys.platform == "win32":
                     self.root.iconbitmap(ico_path)
                 else:
-                    icon_img = tk.PhotoImage(file=ico_path)
-                    self.root.iconphoto(True, icon_img)
+                    self.root.iconphoto(True, load_icon_image(ico_path))
         except Exception as e:
             print(f"Could not set application icon: {e}")
 
@@ -70,9 +352,19 @@ class RetroPixelatorGUI:
         main_frame.columnconfigure(1, weight=1, uniform="col")
         main_frame.rowconfigure(0, weight=1)
 
-        # Update scrollregion when the size of the frame changes
-        def on_frame_configure(event=None):
-            canvas.configure(scrollregion=canvas.bbox("all"))
+        # Update scrollregion when the size of the frame changes.
+        # The frame is the only item of the canvas, so its size is the scrollregion,
+        # a burst of Configure events only updates it once the GUI is idle again
+        self._frame_size = (0, 0)
+        self._scrollregion_pending = False
+        def update_scrollregion():
+            self._scrollregion_pending = False
+            canvas.configure(scrollregion=(0, 0) + self._frame_size)
+        def on_frame_configure(event):
+            self._frame_size = (event.width, event.height)
+            if not self._scrollregion_pending:
+                self._scrollregion_pending = True
+                self.root.after_idle(update_scrollregion)
         main_frame.bind("<Configure>", on_frame_configure)
         # Make sure the canvas resizes the frame width to match the canvas width
         def on_canvas_configure(event=None):
@@ -85,8 +377,18 @@ class RetroPixelatorGUI:
                 canvas.xview_scroll(int(-1*(event.delta/120)), "units")
             else:
                 canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        canvas.bind_all("<Shift-MouseWheel>", _on_mousewheel)
+        # Only listen to the mousewheel while the pointer is over the scrollable content,
+        # the handler already checks for Shift, so a separate Shift-MouseWheel binding isn't needed
+        def _bind_mousewheel(event=None):
+            canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        def _unbind_mousewheel(event):
+            # Moving onto a child widget also leaves the canvas, only unbind once the pointer is outside of it
+            x = event.x_root - canvas.winfo_rootx()
+            y = event.y_root - canvas.winfo_rooty()
+            if not (0 <= x < canvas.winfo_width() and 0 <= y < canvas.winfo_height()):
+                canvas.unbind_all("<MouseWheel>")
+        canvas.bind("<Enter>", _bind_mousewheel)
+        canvas.bind("<Leave>", _unbind_mousewheel)
 
         # LEFT COLUMN FRAME
         left_frame = ttk.Frame(main_frame)
@@ -100,10 +402,9 @@ class RetroPixelatorGUI:
         # Logo and Description side by side, description takes full left column width
         logo_desc_frame = ttk.Frame(left_frame)
         logo_desc_frame.pack(fill=tk.X, padx=5, pady=(0, 5))
-        logo_path = "assets/icon/urp-small.png" if os.path.exists("assets/icon/urp-small.png") else "assets/icon/urp.png"
-        logo_image = PhotoImage(file=logo_path)
-        logo_label = ttk.Label(logo_desc_frame, image=logo_image)
-        logo_label.image = logo_image
+        logo_path = "assets/icon/urp-small.png" if asset_exists("assets/icon/urp-small.png") else "assets/icon/urp.png"
+        # The cached PhotoImage stays referenced by the loader, so it isn't garbage collected
+        logo_label = ttk.Label(logo_desc_frame, image=load_icon_image(logo_path))
         logo_label.pack(side=tk.LEFT, padx=(0, 10), pady=0)
         desc_text = ("The Unofficial Retro Patch applies a pixelated look to Stronghold,\n"
                      "giving it a more retro appearance that feels closer to the original game's art style.\n"
@@ -118,50 +419,37 @@ class RetroPixelatorGUI:
             anchor="center",
         )
         description.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=0)
-        # Dynamically set wraplength to half the window width minus logo width
-        def update_desc_wrap(event=None):
+        # Dynamically set wraplength to half the window width minus logo width,
+        # a burst of Configure events only updates it once the GUI is idle again
+        self._last_wrap = None
+        self._wrap_pending = False
+        def update_desc_wrap():
+            self._wrap_pending = False
             # Get left_frame width, subtract logo width and some padding
             left_width = left_frame.winfo_width()
             logo_width = logo_label.winfo_width()
             pad = 40
             wrap = max(200, left_width - logo_width - pad)
-            description.config(wraplength=wrap)
-        left_frame.bind('<Configure>', update_desc_wrap)
-        logo_label.bind('<Configure>', update_desc_wrap)
+            # Changing the wraplength relayouts the description, only do it if it actually changed
+            if wrap != self._last_wrap:
+                self._last_wrap = wrap
+                description.config(wraplength=wrap)
+        def schedule_desc_wrap(event=None):
+            if not self._wrap_pending:
+                self._wrap_pending = True
+                self.root.after_idle(update_desc_wrap)
+        left_frame.bind('<Configure>', schedule_desc_wrap)
+        logo_label.bind('<Configure>', schedule_desc_wrap)
 
         # Edition selection
         edition_frame = ttk.Frame(left_frame)
         edition_frame.pack(fill=tk.X, padx=5, pady=5)
         ttk.Label(edition_frame, text="Select Stronghold Version:").pack(side=tk.TOP, anchor=tk.W, padx=(0, 5))
         self.edition_images = []
-        edition_image_paths = [
-            "assets/firefly/shde.png",
-            "assets/firefly/shcde.png"
-        ]
-        for path in edition_image_paths:
-            if os.path.exists(path):
-                img = Image.open(path)
-                img.thumbnail((96,48), Image.Resampling.LANCZOS)
-                self.edition_images.append(ImageTk.PhotoImage(img))
-            else:
-                self.edition_images.append(None)
         self.edition_buttons = []
-        edition_buttons_frame = ttk.Frame(edition_frame)
-        edition_buttons_frame.pack(fill=tk.X)
-        for idx, edition in enumerate(self.editions):
-            btn = tk.Button(
-                edition_buttons_frame,
-                image=self.edition_images[idx] if idx < len(self.edition_images) else None,
-                compound="top",
-                command=lambda e=edition: self.select_edition(e),
-                relief=tk.SUNKEN if self.selected_edition.get() == edition else tk.RAISED,
-                width=1,
-                height=60
-            )
-            btn.grid(row=0, column=idx, sticky="nsew", padx=5)
-            self.edition_buttons.append(btn)
-        edition_buttons_frame.columnconfigure(0, weight=1)
-        edition_buttons_frame.columnconfigure(1, weight=1)
+        self.edition_buttons_frame = ttk.Frame(edition_frame)
+        self.edition_buttons_frame.pack(fill=tk.X)
+        self.update_editions(self.editions)
 
         # Game path section
         self.path_frame = ttk.LabelFrame(left_frame, text="Game Installation", padding="10")
@@ -197,10 +485,12 @@ class RetroPixelatorGUI:
         )
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.backup_list.configure(yscrollcommand=scrollbar.set)
+        # Scanned backups by game path, see find_backups()
+        self._backup_cache = {}
         backup_actions = ttk.Frame(left_frame, padding="5")
         backup_actions.pack(fill=tk.X, padx=5, pady=5)
         refresh_btn = ttk.Button(
-            backup_actions, text="Refresh Backup List", command=self.refresh_backups
+            backup_actions, text="Refresh Backup List", command=partial(self.refresh_backups, False)
         )
         refresh_btn.pack(side=tk.LEFT, padx=(0, 5))
         restore_btn = ttk.Button(
@@ -216,29 +506,82 @@ class RetroPixelatorGUI:
         self.preview_canvas.pack(padx=5, pady=5)
         self.preview_image = None
         self.preview_pil = None
+        self._preview_job = None
+        self._preview_executor = ThreadPoolExecutor(max_workers=1)
+        self._preview_request_id = 0
+        self._preview_future = None
+        self._preview_size = None
+        # LRU cache keyed by (edition, pixelation amount, black shadows)
+        self._preview_cache = OrderedDict()
+
+        # The slider and options are created with the first preview, see create_preview_controls()
+        self.right_frame = right_frame
+        self.pixelation_var = tk.DoubleVar(value=0.5)
+        self.black_shadows_var = tk.BooleanVar(value=True)  # Default to True
+        self._preview_controls_built = False
+        self.root.after_idle(self.load_edition_preview)
 
+        # --- FOOTER ---
+        footer = ttk.Frame(root, padding="5")
+        footer.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Progress bar (initially hidden)
+        self.progress_var = tk.DoubleVar()
+        self.progress_bar = ttk.Progressbar(
+            footer, variable=self.progress_var, mode='determinate'
+        )
+        # Don't pack initially - it will be shown when needed
+        self.progress_bar_visible = False
+        self._pending_status = None
+        self._pending_progress = None
+        self._flush_scheduled = False
+        self._last_flush = 0.0
+        
+        # Console output/status
+        self.status_var = tk.StringVar()
+        self.status_var.set("Ready. If the GUI becomes unresponsive during pixelation, please wait until the operation completes.")
+        status_bar = ttk.Label(
+            footer, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W
+        )
+        status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        
+        # Apply pixelation and restore backup buttons (right side)
+        self.apply_button = ttk.Button(
+            footer, text="Apply Pixelation", command=self.apply_pixelation_threaded
+        )
+        self.apply_button.pack(side=tk.RIGHT, padx=(5, 0))
+
+        # Background threads never touch Tk directly, they post their GUI updates to this queue
+        self._ui_queue = queue.Queue()
+        self.pump_ui_queue()
+
+        # Load the heavy pixelation backend while the user looks at the window
+        self.root.after_idle(
+            lambda: threading.Thread(target=preload_backend, daemon=True).start()
+        )
+
+    def create_preview_controls(self):
         # Pixelation amount slider
-        pixelation_frame = ttk.LabelFrame(right_frame, text="Pixelation Amount", padding="10")
+        pixelation_frame = ttk.LabelFrame(self.right_frame, text="Pixelation Amount", padding="10")
         pixelation_frame.pack(fill=tk.X, padx=5, pady=5)
-        self.pixelation_var = tk.DoubleVar(value=0.5)
         self.pixelation_slider = ttk.Scale(
             pixelation_frame,
             from_=0.1,
             to=1.0,
             orient=tk.HORIZONTAL,
             variable=self.pixelation_var,
-            command=self.update_preview
+            command=self.on_pixelation_change
         )
         self.pixelation_slider.pack(fill=tk.X, padx=5, pady=5)
-        self.pixelation_label = ttk.Label(pixelation_frame, text="Pixelation: 0.5")
+        self._last_pixelation_amount = self.pixelation_amount()
+        self.pixelation_label = ttk.Label(pixelation_frame, text=self.pixelation_text())
         self.pixelation_label.pack(anchor=tk.CENTER)
 
         # Options section
-        options_frame = ttk.LabelFrame(right_frame, text="Options", padding="10")
+        options_frame = ttk.LabelFrame(self.right_frame, text="Options", padding="10")
         options_frame.pack(fill=tk.X, padx=5, pady=5)
         
         # Black Shadows toggle
-        self.black_shadows_var = tk.BooleanVar(value=True)  # Default to True
         self.black_shadows_checkbox = ttk.Checkbutton(
             options_frame,
             text="Black Shadows",
@@ -256,36 +599,16 @@ class RetroPixelatorGUI:
         )
         black_shadows_note.pack(anchor=tk.W, padx=5, pady=(0, 2))
 
-        # Now safe to call preview methods
+        self._preview_controls_built = True
+
+    def load_edition_preview(self):
+        # Defer creating the slider and options until the first preview is loaded,
+        # so they are not part of the initial window construction
+        if not self._preview_controls_built:
+            self.create_preview_controls()
         self.load_placeholder_image()
         self.update_preview()
 
-        # --- FOOTER ---
-        footer = ttk.Frame(root, padding="5")
-        footer.pack(side=tk.BOTTOM, fill=tk.X)
-        
-        # Progress bar (initially hidden)
-        self.progress_var = tk.DoubleVar()
-        self.progress_bar = ttk.Progressbar(
-            footer, variable=self.progress_var, mode='determinate'
-        )
-        # Don't pack initially - it will be shown when needed
-        self.progress_bar_visible = False
-        
-        # Console output/status
-        self.status_var = tk.StringVar()
-        self.status_var.set("Ready. If the GUI becomes unresponsive during pixelation, please wait until the operation completes.")
-        status_bar = ttk.Label(
-            footer, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W
-        )
-        status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
-        
-        # Apply pixelation and restore backup buttons (right side)
-        footer_pixelate_btn = ttk.Button(
-            footer, text="Apply Pixelation", command=self.apply_pixelation_threaded
-        )
-        footer_pixelate_btn.pack(side=tk.RIGHT, padx=(5, 0))
-
     def load_placeholder_image(self):
         edition = self.selected_edition.get()
 
@@ -296,53 +619,164 @@ class RetroPixelatorGUI:
         else:
             placeholder_path = "assets/firefly/shde-screenshot.jpg"
 
-        if not os.path.exists(placeholder_path):
+        if not asset_exists(placeholder_path):
             messagebox.showerror(
                 "Error", f"Placeholder image not found: {placeholder_path}"
             )
             return
 
-        self.preview_pil = Image.open(placeholder_path)
+        # Each screenshot is only read and decoded once, switching back to an edition reuses it.
+        # It is decoded at full resolution on purpose, the preview shows a crop of it at 1:1 scale.
+        # Copy, so the cached image can't be modified by the preview pipeline
+        self.preview_pil = load_placeholder(placeholder_path).copy()
 
     def pixelation_amount(self):
         return round(self.pixelation_var.get(), 2)
 
+    def pixelation_text(self):
+        return f"Pixelation: {self.pixelation_amount():.2f} (Recommended: 0.5)"
+
+    def on_pixelation_change(self, event=None):
+        # Neighbouring slider positions often round to the same amount, which wouldn't change anything
+        amount = self.pixelation_amount()
+        if amount == self._last_pixelation_amount:
+            return
+        self._last_pixelation_amount = amount
+
+        # The label is cheap to update, so keep it in sync with the slider
+        self.pixelation_label.config(text=self.pixelation_text())
+        self.schedule_preview()
+
+    def schedule_preview(self, delay=80):
+        # Debounce preview rendering, so a continuous slider drag collapses into a single render
+        if self._preview_job is not None:
+            self.root.after_cancel(self._preview_job)
+        self._preview_job = self.root.after(delay, self._do_update_preview)
+
+    def _do_update_preview(self):
+        self._preview_job = None
+        self.update_preview()
+
     def update_preview(self, event=None):
-        self.pixelation_label.config(text=f"Pixelation: {self.pixelation_amount():.2f} (Recommended: 0.5)")
+        # A debounced slider render that is still pending would only render the same state again
+        if self._preview_job is not None:
+            self.root.after_cancel(self._preview_job)
+            self._preview_job = None
 
-        # Apply pixelation to the placeholder image
-        from pixelation import pixelate_image
-        pil_img = pixelate_image(self.preview_pil, self.pixelation_amount())
+        key = (
+            self.selected_edition.get(),
+            self.pixelation_amount(),
+            self.black_shadows_var.get(),
+        )
 
-        if self.black_shadows_var.get():
-            from pixelation import apply_black_shadows
-            pil_img = apply_black_shadows(pil_img)
-        
-        # Note: Black shadows are not applied to preview images since they are screenshots
-        # without transparency. The black shadows feature will be applied to actual game textures.
-
-        # Make preview square (crop to square center)
-        width, height = pil_img.size
-        side = min(width, height)
-        left = (width - side) // 1.8
-        top = (height - side) // 2
-        right = left + side
-        bottom = top + side
-        pil_img = pil_img.crop((left, top, right, bottom))
-
-        self.preview_image = ImageTk.PhotoImage(pil_img)
-        self.preview_canvas.config(image=self.preview_image, width=560, height=480)
-        self.preview_canvas.image = self.preview_image
+        if self._preview_future is not None:
+            self._preview_future.cancel()  # Only succeeds if it hasn't started yet
+        self._preview_request_id += 1
+        request_id = self._preview_request_id
+
+        # Reuse previously generated previews, e.g. when toggling black shadows back and forth
+        if key in self._preview_cache:
+            self._preview_cache.move_to_end(key)
+            self.show_preview(self._preview_cache[key])
+            return
+
+        # Generate the preview on a worker thread to keep the GUI responsive,
+        # only the latest request is applied once it finishes
+        future = self._preview_future = self._preview_executor.submit(
+            create_preview_image,
+            self.preview_pil,
+            key[1],
+            key[2],
+        )
+        # Done callbacks run on the worker thread, hand the result over through the UI queue
+        future.add_done_callback(
+            lambda f: self.post(self.apply_preview, f, request_id, key)
+        )
+
+    def apply_preview(self, future, request_id, key):
+        # Ignore results of requests that have been superseded in the meantime
+        if request_id != self._preview_request_id or future.cancelled():
+            return
+        try:
+            pil_img = future.result()
+        except Exception as e:
+            self.set_status(f"Failed to generate preview: {e}")
+            return
+
+        self._preview_cache[key] = pil_img
+        if len(self._preview_cache) > PREVIEW_CACHE_SIZE:
+            self._preview_cache.popitem(last=False)
+
+        self.show_preview(pil_img)
+
+    def show_preview(self, pil_img):
+        # PhotoImage must be created on the Tk thread. It's only created once per size,
+        # afterwards the new pixels are pasted into it and the label keeps pointing at the same image
+        if self.preview_image is None or pil_img.size != self._preview_size:
+            self.preview_image = ImageTk.PhotoImage(pil_img)
+            self._preview_size = pil_img.size
+            self.preview_canvas.config(image=self.preview_image, width=PREVIEW_SIZE[0], height=PREVIEW_SIZE[1])
+            self.preview_canvas.image = self.preview_image
+        else:
+            self.preview_image.paste(pil_img)
+
+    def update_editions(self, editions):
+        # Reuse the existing buttons and only create/destroy the difference,
+        # instead of rebuilding all of them
+        n_old, n_new = len(self.edition_buttons), len(editions)
+        for btn in self.edition_buttons[n_new:]:
+            btn.destroy()
+        del self.edition_buttons[n_new:]
+        # grid accepts a list of column indices, so each change is a single Tcl call
+        if n_old > n_new:
+            self.edition_buttons_frame.columnconfigure(tuple(range(n_new, n_old)), weight=0, uniform="")
+
+        # Keep references to the images, so Tk doesn't drop them
+        self.edition_images = [load_edition_image(edition) for edition in editions]
+
+        for idx, edition in enumerate(editions):
+            options = {
+                "image": self.edition_images[idx] or "",
+                "relief": tk.SUNKEN if self.selected_edition.get() == edition else tk.RAISED,
+            }
+            if idx < n_old:
+                self.edition_buttons[idx].config(**options)
+            else:
+                # Image-only buttons, sized by their thumbnail.
+                # Buttons dispatch by their position, so reused buttons keep their command
+                btn = tk.Button(
+                    self.edition_buttons_frame,
+                    compound="image",
+                    command=partial(self.select_edition_by_index, idx),
+                    **options,
+                )
+                btn.grid(row=0, column=idx, sticky="nsew", padx=(5, 5), pady=0)
+                self.edition_buttons.append(btn)
+        if n_new > n_old:
+            # A uniform group keeps all columns equally wide in a single geometry pass
+            self.edition_buttons_frame.columnconfigure(tuple(range(n_old, n_new)), weight=1, uniform="edition_buttons")
+
+        self.editions = list(editions)
+        selected = self.selected_edition.get()
+        self._selected_idx = self.editions.index(selected) if selected in self.editions else None
 
     def select_edition(self, edition):
+        self.select_edition_by_index(self.editions.index(edition))
+
+    def select_edition_by_index(self, new_idx):
+        if new_idx == self._selected_idx:
+            return  # Already selected, nothing changes
+        edition = self.editions[new_idx]
         self.selected_edition.set(edition)
-        for btn, ed in zip(self.edition_buttons, self.editions):
-            btn.config(relief=tk.SUNKEN if ed == edition else tk.RAISED)
+        # Only the previously and newly selected buttons change their relief
+        if self._selected_idx is not None:
+            self.edition_buttons[self._selected_idx].config(relief=tk.RAISED)
+        self.edition_buttons[new_idx].config(relief=tk.SUNKEN)
+        self._selected_idx = new_idx
         self.path_label.config(text=f"{edition} Installation Folder:")
         self.update_path_var_from_config()
         self.refresh_backups()
-        self.load_placeholder_image()
-        self.update_preview()
+        self.load_edition_preview()
 
     def update_path_var_from_config(self):
         edition = self.selected_edition.get()
@@ -354,39 +788,56 @@ class RetroPixelatorGUI:
         else:
             self.path_var.set("")
 
-    def on_edition_change(self, event=None):
-        # Update label and path field
-        self.path_label.config(text=f"{self.selected_edition.get()} Installation Folder:")
-        self.update_path_var_from_config()
-        self.refresh_backups()
-
     def browse_game_path(self):
+        edition = self.selected_edition.get()
+        # The dialog blocks the event loop, so flush pending redraws (e.g. progress updates) first
+        self.root.update_idletasks()
         directory = filedialog.askdirectory(
-            title=f"Select {self.selected_edition.get()} Installation Folder"
+            title=f"Select {edition} Installation Folder"
         )
         if directory:
             self.path_var.set(directory)
-            if self.validate_game_directory(directory):
-                edition = self.selected_edition.get()
-                if not self.config.has_section(edition):
-                    self.config.add_section(edition)
-                self.config.set(
-                    edition, "target_folder", directory
-                )
-                with open("config.ini", "w") as configfile:
-                    self.config.write(configfile)
-                self.status_var.set(f"Game path set to: {directory}")
-                self.refresh_backups()
-            else:
-                messagebox.showerror(
-                    "Invalid Directory",
-                    f"The selected directory does not appear to be a valid {self.selected_edition.get()} installation.",
-                )
-                self.path_var.set("")
+            # Validate on a worker thread, the folder might be on a slow (network) drive
+            def worker():
+                is_valid = self.validate_game_directory(directory, edition)
+                self.post(self.finish_browse_game_path, directory, edition, is_valid)
+            threading.Thread(target=worker, daemon=True).start()
+
+    def finish_browse_game_path(self, directory, edition, is_valid):
+        if edition != self.selected_edition.get() or self.path_var.get() != directory:
+            return  # The selection changed while validating
+        if is_valid:
+            if not self.config.has_section(edition):
+                self.config.add_section(edition)
+            self.config.set(
+                edition, "target_folder", directory
+            )
+            with open("config.ini", "w") as configfile:
+                self.config.write(configfile)
+            self.set_status(f"Game path set to: {directory}")
+            self.refresh_backups(use_cache=False)
+        else:
+            messagebox.showerror(
+                "Invalid Directory",
+                f"The selected directory does not appear to be a valid {edition} installation.",
+            )
+            self.path_var.set("")
+
+    def validate_game_directory(self, directory, edition):
+        try:
+            directory_stat = os.stat(directory)
+        except OSError:
+            return False
+
+        # The mtime of a directory changes when entries are added or removed,
+        # so re-validating the same unchanged folder doesn't hit the (possibly slow) drive again
+        cache_key = (edition, directory, directory_stat.st_mtime_ns)
+        if cache_key not in self._validation_cache:
+            self._validation_cache[cache_key] = self._validate_game_directory(edition, directory)
+        return self._validation_cache[cache_key]
 
-    def validate_game_directory(self, directory):
+    def _validate_game_directory(self, edition, directory):
         # This could be improved to check for each edition's expected files
-        edition = self.selected_edition.get()
         if edition == "Stronghold Definitive Edition":
             exe_path = os.path.join(directory, "Stronghold 1 Definitive Edition.exe")
             data_folder = os.path.join(directory, "Stronghold 1 Definitive Edition_Data")
@@ -397,38 +848,66 @@ class RetroPixelatorGUI:
             # Fallback: just check for any .exe and _Data folder
             exe_path = None
             data_folder = None
-            for file in os.listdir(directory):
-                if file.endswith(".exe"):
-                    exe_path = os.path.join(directory, file)
-                if file.endswith("_Data") and os.path.isdir(os.path.join(directory, file)):
-                    data_folder = os.path.join(directory, file)
+            # scandir reuses the file type from the directory listing, instead of a stat per entry
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if exe_path is None and name.endswith(".exe"):
+                        exe_path = entry.path
+                    elif data_folder is None and name.endswith("_Data") and entry.is_dir():
+                        data_folder = entry.path
+                    if exe_path and data_folder:
+                        break
         if (exe_path and os.path.exists(exe_path)) or (data_folder and os.path.isdir(data_folder)):
             return True
         return False
 
-    def refresh_backups(self):
+    def refresh_backups(self, use_cache=True):
         for item in self.backup_list.get_children():
             self.backup_list.delete(item)
         game_path = self.path_var.get()
         if not game_path or not os.path.exists(game_path):
             return
-        backup_files = []
-        for root, _, files in os.walk(game_path):
-            for file in files:
-                if file.endswith(".backup001") or ".backup" in file:
-                    backup_files.append(os.path.join(root, file))
-        for backup_file in backup_files:
-            relative_path = os.path.relpath(backup_file, game_path)
-            backup_date = self.get_file_modified_date(backup_file)
+        backup_files = self.find_backups(game_path, use_cache)
+        for relative_path, backup_date in backup_files:
             self.backup_list.insert("", "end", values=(relative_path, backup_date))
         if not backup_files:
-            self.status_var.set("No backup files found")
+            self.set_status("No backup files found")
         else:
-            self.status_var.set(f"Found {len(backup_files)} backup files")
+            self.set_status(f"Found {len(backup_files)} backup files")
+
+    def find_backups(self, game_path, use_cache=True):
+        """
+        Find the backup files in a game folder.
+
+        Scans are reused for BACKUP_CACHE_TTL seconds. Backups live in subfolders, so changes to them
+        don't show in any single folder mtime; callers that create or restore backups pass use_cache=False.
+
+        Args:
+            game_path: Path to the game installation
+            use_cache: False to always scan the folder, e.g. after backups have been created or restored
+
+        Returns:
+            List of (relative_path, modified_date) tuples
+        """
+        cached = self._backup_cache.get(game_path)
+        if use_cache and cached is not None and time.monotonic() - cached[0] < BACKUP_CACHE_TTL:
+            return cached[1]
+
+        backup_files = [
+            (os.path.relpath(entry.path, game_path), self.get_file_modified_date(entry))
+            for entry in scan_backup_files(game_path)
+        ]
+        self._backup_cache[game_path] = (time.monotonic(), backup_files)
+        return backup_files
 
     def get_file_modified_date(self, file_path):
         try:
-            mod_time = os.path.getmtime(file_path)
+            if isinstance(file_path, os.DirEntry):
+                # Directory entries of a scan already carry the modification time on Windows
+                mod_time = file_path.stat().st_mtime
+            else:
+                mod_time = os.path.getmtime(file_path)
             from datetime import datetime
             return datetime.fromtimestamp(mod_time).strftime("%Y-%m-%d %H:%M:%S")
         except:
@@ -444,14 +923,100 @@ class RetroPixelatorGUI:
             self.progress_bar.pack_forget()
             self.progress_bar_visible = False
 
+    def set_status(self, message):
+        self._pending_status = message
+        self.schedule_flush()
+
+    def set_progress(self, value):
+        self._pending_progress = value
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        # Coalesce bursts of status/progress updates, so the footer is redrawn at most every ~33ms,
+        # the latest pending values are written once the interval has passed
+        if self._flush_scheduled:
+            return
+        elapsed = time.monotonic() - self._last_flush
+        if elapsed >= STATUS_FLUSH_INTERVAL:
+            self.flush_pending()
+        else:
+            self._flush_scheduled = True
+            delay = max(1, int((STATUS_FLUSH_INTERVAL - elapsed) * 1000))
+            self.root.after(delay, self.flush_pending)
+
+    def flush_pending(self):
+        self._flush_scheduled = False
+        self._last_flush = time.monotonic()
+        if self._pending_status is not None:
+            self.status_var.set(self._pending_status)
+            self._pending_status = None
+        if self._pending_progress is not None:
+            self.progress_var.set(self._pending_progress)
+            self._pending_progress = None
+
+    def post(self, func, *args):
+        """
+        Run a function on the Tk thread, safe to call from any thread.
+
+        Args:
+            func: Function to call
+            *args: Arguments to call it with
+        """
+        self._ui_queue.put((func, args))
+
+    def pump_ui_queue(self):
+        # Run everything posted since the last poll in one go,
+        # status and progress updates are coalesced by set_status/set_progress
+        try:
+            while True:
+                try:
+                    func, args = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    func(*args)
+                except Exception:
+                    # Report it like Tk does for failing callbacks, the remaining posts still run
+                    self.root.report_callback_exception(*sys.exc_info())
+        finally:
+            self.root.after(UI_QUEUE_POLL_INTERVAL, self.pump_ui_queue)
+
+    def handle_log_message(self, msg):
+        self.set_status(msg)
+        # Update progress based on message content
+        progress = parse_texture_progress(msg)
+        if progress is None:
+            return
+        current, total = progress
+        if total > 0:
+            self.set_progress((current / total) * 100)
+
+    def _begin_progress_ui(self):
+        self.show_progress_bar()
+        self.set_progress(0)
+        self.set_status("Applying pixelation... This may take a while")
+        self.apply_button.state(["disabled"])
+
+    def _finish_progress_ui(self):
+        # Hide progress bar and reset status after a delay
+        def cleanup():
+            self.hide_progress_bar()
+            self.set_status("Ready")
+        self.apply_button.state(["!disabled"])
+        self.root.after(1000, cleanup)
+
     def apply_pixelation_threaded(self):
+        # Read the options on the Tk thread, the worker must not touch any Tk variables
+        game_path = self.path_var.get()
+        edition = self.selected_edition.get()
+        black_shadows = self.black_shadows_var.get()
+        resize_amount = self.pixelation_amount()
+
         # Run pixelation in a background thread to keep GUI responsive
         def worker():
-            game_path = self.path_var.get()
             if not game_path or not os.path.exists(game_path):
-                self.root.after(0, lambda: self.status_var.set("Error: Please select a valid game installation path first."))
+                self.post(self.set_status, "Error: Please select a valid game installation path first.")
                 return
-            edition = self.selected_edition.get()
             if not self.config.has_section(edition):
                 self.config.add_section(edition)
             self.config.set(edition, "target_folder", game_path)
@@ -459,57 +1024,34 @@ class RetroPixelatorGUI:
                 self.config.write(configfile)
             
             # Show progress bar and set initial status
-            self.root.after(0, self.show_progress_bar)
-            self.root.after(0, lambda: self.progress_var.set(0))
-            self.root.after(0, lambda: self.status_var.set("Applying pixelation... This may take a while"))
+            self.post(self._begin_progress_ui)
             
             def gui_logger(msg):
-                # Use root.after() for thread-safe GUI updates
-                self.root.after(0, lambda: self.status_var.set(str(msg)))
-                # Update progress based on message content with throttling
-                if "Pixelating texture" in str(msg) and "/" in str(msg):
-                    try:
-                        # Extract progress from message like "Pixelating texture 1/5"
-                        msg_str = str(msg)
-                        # Find the part with numbers like "1/5"
-                        import re
-                        match = re.search(r'(\d+)/(\d+)', msg_str)
-                        if match:
-                            current, total = map(int, match.groups())
-                            progress_percent = (current / total) * 100
-                            # Throttle progress updates to every 5% or every texture if less than 20 total
-                            if total <= 20 or current % max(1, total // 20) == 0 or current == total:
-                                self.root.after(0, lambda: self.progress_var.set(progress_percent))
-                    except:
-                        pass  # If parsing fails, just continue
+                self.post(self.handle_log_message, str(msg))
             
             try:
-                # Get the black shadows option from the GUI
-                black_shadows = self.black_shadows_var.get()
+                # Imported lazily, usually it has already been loaded by preload_backend()
+                from main import pixelate_edition, replace_files
                 files_to_replace = pixelate_edition(
                     edition,
                     logger=gui_logger,
-                    resize_amount=self.pixelation_amount(),
+                    resize_amount=resize_amount,
                     black_shadows=black_shadows
                 )
-                gc.collect()  # Run garbage collection to free memory
-                time.sleep(1)  # Allow GUI to update before showing completion message
-                self.root.after(0, lambda: self.status_var.set("Pixelation has been applied successfully!"))
+                self.post(self.set_status, "Pixelation has been applied successfully!")
 
 
-                self.root.after(0, lambda: self.status_var.set("Replacing files..."))
+                self.post(self.set_status, "Replacing files...")
                 replace_files(files_to_replace, logger=gui_logger)
-                self.root.after(0, lambda: self.status_var.set("Files replaced successfully!"))
+                self.post(self.set_status, "Files replaced successfully!")
 
-                self.root.after(0, self.refresh_backups)
+                self.post(self.refresh_backups, False)
             except Exception as e:
-                self.root.after(0, lambda: self.status_var.set(f"Failed to apply pixelation: {str(e)}"))
+                # Some backups may already have been created, don't serve the old scan
+                self.post(self._backup_cache.pop, game_path, None)
+                self.post(self.set_status, f"Failed to apply pixelation: {str(e)}")
             finally:
-                # Hide progress bar and reset status after a delay
-                def cleanup():
-                    self.root.after(0, self.hide_progress_bar)
-                    self.root.after(0, lambda: self.status_var.set("Ready"))
-                self.root.after(1000, cleanup)
+                self.post(self._finish_progress_ui)
         
         threading.Thread(target=worker, daemon=True).start()
 
@@ -524,8 +1066,7 @@ class RetroPixelatorGUI:
         relative_path = item["values"][0]
         game_path = self.path_var.get()
         backup_file = os.path.join(game_path, relative_path)
-        import re
-        original_file = re.sub(r"\.backup\d{3}$", "", backup_file)
+        original_file = BACKUP_SUFFIX_RE.sub("", backup_file)
         if not os.path.exists(backup_file):
             messagebox.showerror("Error", f"Backup file not found: {backup_file}")
             return
@@ -536,8 +1077,10 @@ class RetroPixelatorGUI:
             if os.path.exists(original_file + ".tmp"):
                 os.remove(original_file + ".tmp")
             messagebox.showinfo("Success", f"Successfully restored: {relative_path}")
-            self.refresh_backups()
+            self.refresh_backups(use_cache=False)
         except Exception as e:
+            # The rename may have partly happened, don't serve the old scan
+            self._backup_cache.pop(game_path, None)
             messagebox.showerror("Error", f"Failed to restore backup: {str(e)}")
 
 def main():
@@ -547,4 +1090,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Asset files are pixelated in worker processes, which re-run the frozen executable
+    multiprocessing.freeze_support()
     main()
@@ -1,20 +1,78 @@
 import os
 import warnings
-import UnityPy
+import shutil
 import configparser
+from functools import lru_cache
+from dataclasses import dataclass
 from dotenv import load_dotenv
-from unitypy_fixes import patch_unitypy
-from pixelation import process_image
+from pixelation import process_image, DOWNSAMPLE_FILTERS
 import gc
 import time
+import queue
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import psutil
 
 
-load_dotenv()
-DEBUG_ENABLED = os.getenv("DEBUG_ENABLED", "False").lower() in ("true", "1", "yes")
+# The .env file is loaded on first use, see load_env()
+_env_loaded = False
 
+# UnityPy takes a while to import, so it's imported (and patched) on first use, see load_unitypy()
+_unitypy = None
 
-patch_unitypy()
+# Modified asset files can be several GB, they are written in chunks of this size
+WRITE_CHUNK_SIZE = 16 << 20
+
+# Replacing a locked asset file is retried after this many seconds, doubling each time,
+# for at most REPLACE_MAX_WAIT seconds in total
+REPLACE_RETRY_DELAY = 0.05
+REPLACE_MAX_WAIT = 30
+
+# At most this many asset files are processed at the same time, every worker process holds
+# a whole asset file (UnityPy environment) and up to TEXTURE_WORKERS decoded textures in memory
+ASSET_FILE_WORKERS = 2
+
+# Textures of one asset file are pixelated in this many threads. Pillow releases the GIL in
+# resize/composite/point/paste, so threads scale without pickling textures to other processes.
+# Decoded textures are several hundred MB, so only this many are kept in memory at once
+TEXTURE_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def load_env():
+    """Load the .env file into the environment, only once per process."""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
+
+def is_debug_enabled():
+    """
+    Check whether debug mode is enabled, read from the environment on each call.
+
+    Returns:
+        bool: True if DEBUG_ENABLED is set to true, 1 or yes
+    """
+    load_env()
+    return os.getenv("DEBUG_ENABLED", "False").lower() in ("true", "1", "yes")
+
+
+def load_unitypy():
+    """
+    Import UnityPy and apply the fixes from unitypy_fixes, only once per process.
+
+    Returns:
+        The UnityPy module
+    """
+    global _unitypy
+    if _unitypy is None:
+        import UnityPy
+        from unitypy_fixes import patch_unitypy
+
+        patch_unitypy()
+        _unitypy = UnityPy
+    return _unitypy
 
 
 def log_memory_usage(logger=None):
@@ -29,87 +87,249 @@ def log_memory_usage(logger=None):
     except ImportError:
         pass  # psutil not available
 
-def is_file_locked(filepath):
-    """Check if file is locked by another process."""
+def write_chunked(f, data, chunk_size=WRITE_CHUNK_SIZE):
+    """
+    Write bytes to a file in chunks, without copying them.
+
+    Args:
+        f: File opened in binary mode
+        data: Bytes-like object to write
+        chunk_size: Maximum number of bytes per write
+    """
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        f.write(view[start:start + chunk_size])
+
+def latest_backup_no(asset_file):
+    """
+    Get the number of the latest backup of an asset file, e.g. 2 for "resources.assets.backup002".
+
+    Args:
+        asset_file: Path to the asset file
+
+    Returns:
+        int: Number of the latest backup, 0 if there is none
+    """
+    # A single directory listing instead of checking every backup number one by one
+    prefix = os.path.basename(asset_file) + ".backup"
+    latest = 0
+    with os.scandir(os.path.dirname(asset_file) or ".") as entries:
+        for entry in entries:
+            suffix = entry.name[len(prefix):]
+            if entry.name.startswith(prefix) and len(suffix) == 3 and suffix.isdecimal():
+                latest = max(latest, int(suffix))
+    return latest
+
+def replace_with_retry(src, dst, logger=print, max_wait=REPLACE_MAX_WAIT):
+    """
+    os.replace() a file, retrying with exponential backoff while the target is locked (e.g. by the game).
+
+    Args:
+        src: Path of the file to move
+        dst: Path of the file to replace
+        logger: Function to log messages with
+        max_wait: Maximum number of seconds to keep retrying
+
+    Raises:
+        PermissionError: If the file is still locked after max_wait seconds
+        OSError: If the file couldn't be replaced for any other reason
+    """
+    delay = REPLACE_RETRY_DELAY
+    waited = 0
+    while True:
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if waited >= max_wait:
+                raise
+            delay = min(delay, max_wait - waited)
+            logger(f"[UNOFFICIAL RETRO PATCH] File locked, retrying in {delay:.2f}s: {dst}")
+            time.sleep(delay)
+            waited += delay
+            delay *= 2
+
+def split_config_list(value):
+    """
+    Split a comma separated config value into a list, ignoring empty items.
+
+    Args:
+        value: Comma separated string
+
+    Returns:
+        List of stripped strings
+    """
+    return [item for item in (item.strip() for item in value.split(",")) if item]
+
+
+@dataclass
+class EditionConfig:
+    """Settings of an edition, resolved from the environment and config.ini."""
+
+    target_folder: str
+    assets_folder: str
+    masks_folder: str
+    debug_pixelated_folder: str
+    resize_amount: float
+    quantize_colors: int
+    downsample_filter: str
+    pixelate_files: list
+    ignore_black_shadow_files: frozenset
+
+
+@dataclass(frozen=True)
+class PixelateEntry:
+    """A texture to pixelate, e.g. resources.assets/texture_name.png"""
+
+    asset_dir: str  # e.g. resources.assets
+    asset: str  # e.g. texture_name.png
+    asset_name: str  # e.g. texture_name
+    asset_ext: str  # e.g. .png
+    mask_file: str  # e.g. assets/masks/Stronghold Definitive Edition/resources.assets/texture_name.png
+    mask_exists: bool  # checked once when the entry is created instead of per texture
+
+
+def load_config(config_file="config.ini"):
+    """
+    Load the config file, parsed only once until the file is modified.
+
+    The returned ConfigParser is shared, so it must not be modified.
+
+    Args:
+        config_file: Path to the config file
+
+    Returns:
+        ConfigParser, empty if the file doesn't exist
+    """
+    # The size is part of the key too, as the mtime resolution can be coarse (e.g. 2 seconds on FAT)
     try:
-        with open(filepath, 'r+b'):
-            return False
-    except (PermissionError, OSError):
-        return True
+        stat = os.stat(config_file)
+        mtime_ns, size = stat.st_mtime_ns, stat.st_size
+    except OSError:
+        mtime_ns, size = None, None
+    return _load_config(config_file, mtime_ns, size)
+
+
+@lru_cache(maxsize=4)
+def _load_config(config_file, mtime_ns, size):
+    config = configparser.ConfigParser()
+    config.read(config_file)
+    return config
+
+
+def _get_setting(config, edition_name, env_prefix, key, fallback, cast=str):
+    """
+    Get a setting of an edition, the environment variable (e.g. <EDITION>_RESIZE_AMOUNT) takes precedence.
+
+    Args:
+        config: ConfigParser of config.ini
+        edition_name: Name of the edition (config section)
+        env_prefix: Prefix of the environment variables of the edition
+        key: Name of the setting in config.ini
+        fallback: Value if the setting is neither in the environment nor in config.ini
+        cast: Function to convert the value with
+
+    Returns:
+        The converted value of the setting
+    """
+    value = os.getenv(f"{env_prefix}_{key.upper()}") or config.get(edition_name, key, fallback=fallback)
+    return cast(value)
+
+
+def load_edition_config(edition_name: str) -> EditionConfig:
+    """
+    Resolve the settings of an edition, environment variables take precedence over config.ini.
+
+    Args:
+        edition_name: Name of the edition (config section)
+
+    Returns:
+        EditionConfig
+    """
+    load_env()
+    config = load_config()
+
+    # e.g. STRONGHOLD_DEFINITIVE_EDITION
+    env_prefix = edition_name.upper().replace(" ", "_")
+
+    def get_setting(key, fallback, cast=str):
+        return _get_setting(config, edition_name, env_prefix, key, fallback, cast)
+
+    target_folder = get_setting("target_folder", f"downloads/{edition_name}")
+    resize_amount = get_setting("resize_amount", 0.5, float)
+    # Number of colors the pixelated textures are reduced to, 0 keeps all colors
+    quantize_colors = get_setting("quantize_colors", 0, int)
+    if not 0 <= quantize_colors <= 256:
+        raise ValueError(f"quantize_colors must be between 0 and 256, got {quantize_colors}")
+
+    # Filter used to downscale the textures, see pixelation.DOWNSAMPLE_FILTERS
+    downsample_filter = get_setting("downsample_filter", "nearest").strip().lower()
+    if downsample_filter not in DOWNSAMPLE_FILTERS:
+        raise ValueError(
+            f"Unknown downsample_filter '{downsample_filter}', expected one of: {', '.join(DOWNSAMPLE_FILTERS)}"
+        )
+
+    pixelate_files = get_setting("pixelate_files", "")
+
+    return EditionConfig(
+        target_folder=target_folder,
+        assets_folder=config.get(
+            edition_name, "assets_folder", fallback=f"{edition_name}_Data/resources.assets"
+        ),
+        masks_folder=config.get(
+            edition_name, "masks_folder", fallback=f"assets/masks/{edition_name}"
+        ),
+        debug_pixelated_folder=config.get(
+            edition_name,
+            "debug_pixelated_folder",
+            fallback=f"downloads/{edition_name}/pixelated",
+        ),
+        resize_amount=resize_amount,
+        quantize_colors=quantize_colors,
+        downsample_filter=downsample_filter,
+        # Get the list of files to pixelate from the config
+        pixelate_files=split_config_list(pixelate_files),
+        # Checked for every texture, so a set instead of a list
+        ignore_black_shadow_files=frozenset(split_config_list(
+            config.get(edition_name, "ignore_black_shadow_files", fallback="")
+        )),
+    )
+
 
 def pixelate_edition(edition_name: str, logger=None, resize_amount=False, black_shadows=False):
     if logger is None:
         logger = print
-    config = configparser.ConfigParser()
-    config.read("config.ini")
 
     logger(f"\n[UNOFFICIAL RETRO PATCH] Pixelating edition: {edition_name}")
     log_memory_usage(logger)
 
-    target_folder = os.getenv(
-        f"{edition_name.upper().replace(' ', '_')}_TARGET_FOLDER"
-    ) or config.get(edition_name, "target_folder", fallback=f"downloads/{edition_name}")
+    edition_config = load_edition_config(edition_name)
+
+    target_folder = edition_config.target_folder
     if not os.path.exists(target_folder):
         raise FileNotFoundError(f"Target folder '{target_folder}' does not exist.")
 
-    assets_folder = config.get(
-        edition_name, "assets_folder", fallback=f"{edition_name}_Data/resources.assets"
-    )
+    assets_folder = edition_config.assets_folder
     if not os.path.exists(os.path.join(target_folder, assets_folder)):
         raise FileNotFoundError(
             f"Assets folder '{assets_folder}' does not exist in target folder '{target_folder}'."
         )
 
-    masks_folder = config.get(
-        edition_name, "masks_folder", fallback=f"assets/masks/{edition_name}"
-    )
+    masks_folder = edition_config.masks_folder
     if not os.path.exists(masks_folder):
         raise FileNotFoundError(f"Masks folder '{masks_folder}' does not exist.")
 
-    debug_pixelated_folder = config.get(
-        edition_name,
-        "debug_pixelated_folder",
-        fallback=f"downloads/{edition_name}/pixelated",
-    )
+    debug_pixelated_folder = edition_config.debug_pixelated_folder
 
     if not resize_amount:
-        if os.getenv(f"{edition_name.upper().replace(' ', '_')}_RESIZE_AMOUNT"):
-            resize_amount = float(
-                os.getenv(f"{edition_name.upper().replace(' ', '_')}_RESIZE_AMOUNT")
-            )
-        else:
-            resize_amount = config.getfloat(edition_name, "resize_amount", fallback=0.5)
+        resize_amount = edition_config.resize_amount
 
-    if os.getenv(f"{edition_name.upper().replace(' ', '_')}_PIXELATE_FILES"):
-        pixelate_files = os.getenv(
-            f"{edition_name.upper().replace(' ', '_')}_PIXELATE_FILES"
-        )
-    else:
-        pixelate_files = config.get(edition_name, "pixelate_files", fallback="")
-
-    # Get the list of files to pixelate from the config
-    pixelate_files = list(
-        filter(
-            None,
-            map(
-                str.strip,
-                pixelate_files.split(","),
-            ),
-        )
-    )
+    pixelate_files = edition_config.pixelate_files
     if len(pixelate_files) == 0:
         logger(f"[UNOFFICIAL RETRO PATCH] No files to pixelate for {edition_name}.")
         return
 
-    ignore_black_shadow_files = list(
-        filter(
-            None,
-            map(
-                str.strip,
-                config.get(edition_name, "ignore_black_shadow_files", fallback="").split(","),
-            ),
-        )
-    )
+    ignore_black_shadow_files = edition_config.ignore_black_shadow_files
 
     # Group pixelate_files by their directory,
     # so we can process them by the asset file (to avoid loading all asset files via UnityPy)
@@ -126,193 +346,371 @@ def pixelate_edition(edition_name: str, logger=None, resize_amount=False, black_
             continue
 
         # e.g. texture_name.png
-        pixelate_file = os.path.basename(pixelate_file)
-        [name, extension] = os.path.splitext(pixelate_file)
+        asset = os.path.basename(pixelate_file)
+        [name, extension] = os.path.splitext(asset)
 
         if asset_file not in pixelate_asset_files:
             # e.g. resources.assets
             pixelate_asset_files[asset_file] = []
 
+        mask_file = os.path.join(masks_folder, asset_dir, asset)
         pixelate_asset_files[asset_file].append(
-            {
-                "asset_dir": asset_dir,  # e.g. resources.assets
-                "asset": pixelate_file,  # e.g. texture_name.png
-                "asset_name": name,  # e.g. texture_name
-                "asset_ext": extension,  # e.g. .png
-                "mask_file": os.path.join(
-                    masks_folder, f"{asset_dir}/{pixelate_file}"
-                ),  # e.g. assets/masks/Stronghold Definitive Edition/resources.assets/texture_name.png
-            }
+            PixelateEntry(
+                asset_dir=asset_dir,
+                asset=asset,
+                asset_name=name,
+                asset_ext=extension,
+                mask_file=mask_file,
+                mask_exists=os.path.exists(mask_file),
+            )
         )
 
     # Calculate total textures across all asset files for overall progress
-    total_textures_across_files = 0
-    for asset_file in pixelate_asset_files:
-        total_textures_across_files += len(pixelate_asset_files[asset_file])
-    
+    total_textures_across_files = sum(len(entries) for entries in pixelate_asset_files.values())
+
     processed_textures_total = 0
     logger(f"[UNOFFICIAL RETRO PATCH] Total textures to process: {total_textures_across_files}")
     log_memory_usage(logger)
 
-    # Store pairs of (original_file, temp_file) to process after the loop
-    files_to_replace = []
+    def on_texture(asset_name):
+        nonlocal processed_textures_total
+        processed_textures_total += 1
+        logger(f"[UNOFFICIAL RETRO PATCH] Pixelating texture {processed_textures_total}/{total_textures_across_files}: {asset_name}")
+
+    total_asset_files = len(pixelate_asset_files)
+    jobs = [
+        (
+            asset_file,
+            entries,
+            index,
+            total_asset_files,
+            resize_amount,
+            black_shadows,
+            ignore_black_shadow_files,
+            debug_pixelated_folder,
+            edition_config.quantize_colors,
+            edition_config.downsample_filter,
+        )
+        for index, (asset_file, entries) in enumerate(pixelate_asset_files.items(), start=1)
+    ]
+
+    # Asset files are independent of each other, so multiple of them are processed in parallel,
+    # which also overlaps loading/saving one asset file with pixelating the others.
+    # With a single CPU the worker processes would only add overhead, so they are processed one by one.
+    # Store pairs of (original_file, temp_file) to process afterwards
+    if total_asset_files > 1 and (os.cpu_count() or 1) > 1:
+        results = _process_asset_files_parallel(jobs, logger, on_texture)
+    else:
+        results = []
+        for job in jobs:
+            results.append(_process_asset_file(*job, logger, on_texture))
+            # The UnityPy environment of an asset file holds the whole file and has reference cycles,
+            # so it's collected once it's done instead of whenever the next automatic gc run happens
+            gc.collect()
+    files_to_replace = [result for result in results if result is not None]
 
-    for asset_file in pixelate_asset_files:
-        try:
-            # --- Restore latest backup if it exists ---
-            backup_no = 1
-            backup_file = f"{asset_file}.backup{backup_no:03}"
-            latest_backup = None
-            while os.path.exists(backup_file):
-                latest_backup = backup_file
-                backup_no += 1
-                backup_file = f"{asset_file}.backup{backup_no:03}"
-            if latest_backup:
-                logger(f"[UNOFFICIAL RETRO PATCH] Restoring latest backup before pixelation: {latest_backup}")
-                if os.path.exists(asset_file):
-                    os.remove(asset_file)
-                os.rename(latest_backup, asset_file)
-
-            env = UnityPy.load(asset_file)
-            total_textures = sum(1 for obj in env.objects if obj.type.name == "Texture2D")
-            processed_textures = 0
-
-            # Get total number of textures to process across all asset files
-            total_asset_files = len(pixelate_asset_files)
-            current_asset_file_index = list(pixelate_asset_files.keys()).index(asset_file) + 1
-            
-            logger(f"[UNOFFICIAL RETRO PATCH] Processing asset file {current_asset_file_index}/{total_asset_files}: {os.path.basename(asset_file)}")
-
-            # Prepare data for parallel processing
-            texture_data_list = []
+    return files_to_replace
+
+
+def peek_object_name(obj):
+    """
+    Get the name of an object without reading (parsing) the whole object.
+
+    Args:
+        obj: UnityPy ObjectReader
+
+    Returns:
+        str: Name of the object, or None if it can't be peeked (e.g. older UnityPy versions)
+    """
+    peek_name = getattr(obj, "peek_name", None)
+    if peek_name is None:
+        return None
+    try:
+        return peek_name()
+    except Exception:
+        return None
+
+
+def _process_asset_file(
+    asset_file,
+    entries,
+    index,
+    total_asset_files,
+    resize_amount,
+    black_shadows,
+    ignore_black_shadow_files,
+    debug_pixelated_folder,
+    quantize_colors,
+    downsample_filter,
+    logger,
+    on_texture,
+):
+    """
+    Pixelate the textures of one asset file and save it to a temporary file.
+
+    Args:
+        asset_file: Path to the asset file
+        entries: List of PixelateEntry of this asset file
+        index: Number of this asset file (for logging)
+        total_asset_files: Total number of asset files (for logging)
+        resize_amount: Float between 0 and 1
+        black_shadows: Boolean to enable black shadows feature
+        ignore_black_shadow_files: Set of files black shadows must not be applied to
+        debug_pixelated_folder: Folder the pixelated textures are exported to in debug mode
+        quantize_colors: Number of colors to reduce the pixelated textures to, 0 to keep all colors
+        downsample_filter: Name of the filter used to downscale the textures, e.g. "nearest"
+        logger: Function to log messages with
+        on_texture: Function called with the asset name before each texture is pixelated
+
+    Returns:
+        Tuple of (asset_file, modified_asset_file), or None if the asset file couldn't be processed
+    """
+    try:
+        # --- Restore latest backup if it exists ---
+        backup_no = latest_backup_no(asset_file)
+        latest_backup = f"{asset_file}.backup{backup_no:03}" if backup_no else None
+        if latest_backup:
+            logger(f"[UNOFFICIAL RETRO PATCH] Restoring latest backup before pixelation: {latest_backup}")
+            if os.path.exists(asset_file):
+                os.remove(asset_file)
+            os.rename(latest_backup, asset_file)
+
+        env = load_unitypy().load(asset_file)
+        logger(f"[UNOFFICIAL RETRO PATCH] Processing asset file {index}/{total_asset_files}: {os.path.basename(asset_file)}")
+
+        entries_by_name = {entry.asset_name: entry for entry in entries}
+        debug_enabled = is_debug_enabled()
+
+        # Textures are decoded and written back in this thread (UnityPy isn't thread-safe),
+        # only the pixelation itself runs in the thread pool
+        processed_textures = 0
+        modified_objects = []  # Track which objects were modified
+        pending = deque()
+
+        def finish_texture(obj, data, pixelate_entry, future):
+            asset_name = pixelate_entry.asset_name
+            try:
+                pixelated_image = future.result()
+                data.image = pixelated_image
+                data.save()
+                modified_objects.append(obj)  # Track that this object was modified
+
+                logger(f"[UNOFFICIAL RETRO PATCH] Successfully pixelated {asset_name} in {asset_file}")
+
+                if debug_enabled:
+                    debug_path = os.path.join(
+                        debug_pixelated_folder, pixelate_entry.asset_dir, pixelate_entry.asset
+                    )
+                    os.makedirs(
+                        os.path.dirname(debug_path), exist_ok=True
+                    )
+                    pixelated_image.save(debug_path)
+                    logger(f"[UNOFFICIAL RETRO PATCH | DEBUG] Successfully exported pixelated {asset_name} in {debug_path}")
+            except Exception as e:
+                warnings.warn(f"Failed to pixelate {asset_name} in {asset_file}: {e}")
+
+        with ThreadPoolExecutor(max_workers=TEXTURE_WORKERS) as executor:
+            # A single pass over the objects, only the textures we need to process are read,
+            # objects whose name can be peeked are skipped without reading (parsing) them
             for obj in env.objects:
-                if obj.type.name == "Texture2D":
-                    # Check if this object matches any of the textures we need to process
-                    for pixelate_entry in pixelate_asset_files[asset_file]:
-                        asset_dir, asset, asset_name, asset_ext, mask_file = (
-                            pixelate_entry.values()
-                        )
-                        texture_data_list.append((obj, pixelate_entry, asset_file))
-
-            # Process textures sequentially for now (simpler and more reliable)
-            processed_textures = 0
-            modified_objects = []  # Track which objects were modified
-            
-            for obj, pixelate_entry, asset_file in texture_data_list:
-                asset_dir, asset, asset_name, asset_ext, mask_file = pixelate_entry.values()
-                
+                if obj.type.name != "Texture2D":
+                    continue
+                peeked_name = peek_object_name(obj)
+                if peeked_name is not None and peeked_name not in entries_by_name:
+                    continue
+                asset_name = obj.path_id
+
                 try:
                     data = obj.read()
-                    
-                    if not hasattr(data, "m_Name") or not data.m_Name == asset_name:
+
+                    pixelate_entry = entries_by_name.get(getattr(data, "m_Name", None))
+                    if pixelate_entry is None:
                         continue
-                    
-                    if hasattr(data, "image"):
-                        processed_textures_total += 1
-                        processed_textures += 1
-                        logger(f"[UNOFFICIAL RETRO PATCH] Pixelating texture {processed_textures_total}/{total_textures_across_files}: {asset_name}")
-                        
-                        data.image = process_image(
-                            image=data.image,
-                            resize_amount=resize_amount,
-                            mask_file=mask_file,
-                            asset_name=asset_name,
-                            black_shadows=(black_shadows and f"{asset_dir}/{asset}" not in ignore_black_shadow_files),
-                        )
-                        data.save()
-                        modified_objects.append(obj)  # Track that this object was modified
-                        
-                        logger(f"[UNOFFICIAL RETRO PATCH] Successfully pixelated {asset_name} in {asset_file}")
-                        
-                        if DEBUG_ENABLED:
-                            debug_path = os.path.join(
-                                debug_pixelated_folder, asset_dir, asset
-                            )
-                            os.makedirs(
-                                os.path.dirname(debug_path), exist_ok=True
-                            )
-                            data.image.save(debug_path)
-                            logger(f"[UNOFFICIAL RETRO PATCH | DEBUG] Successfully exported pixelated {asset_name} in {debug_path}")
-                    else:
+                    asset_name = pixelate_entry.asset_name
+
+                    # Decoding the image is expensive, so it is only read once
+                    try:
+                        image = data.image
+                    except AttributeError:
                         warnings.warn(f"[UNOFFICIAL RETRO PATCH] {asset_name} in {asset_file} does not have an image attribute.")
+                        continue
+
+                    processed_textures += 1
+                    on_texture(asset_name)
+                    future = executor.submit(
+                        process_image,
+                        image=image,
+                        resize_amount=resize_amount,
+                        mask_file=pixelate_entry.mask_file if pixelate_entry.mask_exists else None,
+                        asset_name=asset_name,
+                        black_shadows=(
+                            black_shadows
+                            and f"{pixelate_entry.asset_dir}/{pixelate_entry.asset}" not in ignore_black_shadow_files
+                        ),
+                        quantize_colors=quantize_colors,
+                        downsample_filter=downsample_filter,
+                    )
+                    del image
+                    pending.append((obj, data, pixelate_entry, future))
                 except Exception as e:
                     warnings.warn(f"Failed to pixelate {asset_name} in {asset_file}: {e}")
-            
-            if processed_textures == 0:
-                logger(f"[UNOFFICIAL RETRO PATCH] No textures to process in {asset_file}")
-            else:
-                logger(f"[UNOFFICIAL RETRO PATCH] Modified {len(modified_objects)} objects in {asset_file}")
-
-            # Save the modified asset file to temp location
-            modified_asset_file = asset_file + ".tmp"
-            try:
-                logger(f"[UNOFFICIAL RETRO PATCH] Saving modified asset file to: {modified_asset_file}")
-                with open(modified_asset_file, "wb") as f:
-                    f.write(env.file.save())
-                
-                # Verify the temp file was created
-                if os.path.exists(modified_asset_file):
-                    file_size = os.path.getsize(modified_asset_file)
-                    logger(f"[UNOFFICIAL RETRO PATCH] Temporary file created: {modified_asset_file} ({file_size} bytes)")
-                    # Store the files for later processing
-                    files_to_replace.append((asset_file, modified_asset_file))
-                else:
-                    raise Exception("Temporary file was not created")
+                    continue
 
-                logger(
-                    f"[UNOFFICIAL RETRO PATCH] Prepared modified asset file for replacement: {asset_file}"
-                )
-                log_memory_usage(logger)
-            except Exception as e:
-                warnings.warn(f"Failed to save modified asset file '{asset_file}': {e}")
-                continue
+                # Write back the oldest texture before decoding more of them
+                if len(pending) >= TEXTURE_WORKERS:
+                    finish_texture(*pending.popleft())
+
+            while pending:
+                finish_texture(*pending.popleft())
+
+        if processed_textures == 0:
+            logger(f"[UNOFFICIAL RETRO PATCH] No textures to process in {asset_file}")
+        else:
+            logger(f"[UNOFFICIAL RETRO PATCH] Modified {len(modified_objects)} objects in {asset_file}")
+
+        # Save the modified asset file to temp location
+        modified_asset_file = asset_file + ".tmp"
+        try:
+            logger(f"[UNOFFICIAL RETRO PATCH] Saving modified asset file to: {modified_asset_file}")
+            with open(modified_asset_file, "wb") as f:
+                # UnityPy can only serialize to bytes, they aren't kept around once they are written
+                write_chunked(f, env.file.save())
+                file_size = f.tell()
+            logger(f"[UNOFFICIAL RETRO PATCH] Temporary file created: {modified_asset_file} ({file_size} bytes)")
+
+            logger(
+                f"[UNOFFICIAL RETRO PATCH] Prepared modified asset file for replacement: {asset_file}"
+            )
+            log_memory_usage(logger)
+            # Store the files for later processing
+            return asset_file, modified_asset_file
+        except Exception as e:
+            warnings.warn(f"Failed to save modified asset file '{asset_file}': {e}")
+            return None
+    except Exception as e:
+        warnings.warn(
+            f"[UNOFFICIAL RETRO PATCH] Failed to load asset file '{asset_file}': {e}"
+        )
+        return None
+    finally:
+        # Compressed textures are only reused within an asset file
+        if _unitypy is not None:
+            from unitypy_fixes import clear_compress_cache
+
+            clear_compress_cache()
+
+
+def _process_asset_file_in_subprocess(job, log_queue):
+    """
+    Run _process_asset_file in a worker process, forwarding its log messages to the parent process.
+
+    Args:
+        job: Tuple of the positional arguments of _process_asset_file
+        log_queue: Queue of ("log", message) and ("texture", asset_name) tuples
+
+    Returns:
+        Result of _process_asset_file
+    """
+    try:
+        return _process_asset_file(
+            *job,
+            logger=lambda msg: log_queue.put(("log", str(msg))),
+            on_texture=lambda asset_name: log_queue.put(("texture", asset_name)),
+        )
+    finally:
+        # Free the UnityPy environment before the worker picks up its next asset file
+        gc.collect()
+
+
+def _process_asset_files_parallel(jobs, logger, on_texture):
+    """
+    Process multiple asset files at the same time, in up to ASSET_FILE_WORKERS worker processes.
+
+    Log messages of the workers are passed on to the logger of the calling process,
+    so progress reporting works the same as when processing sequentially.
+
+    Args:
+        jobs: List of tuples of the positional arguments of _process_asset_file
+        logger: Function to log messages with
+        on_texture: Function called with the asset name before each texture is pixelated
+
+    Returns:
+        List of results of _process_asset_file, in the order of the jobs
+    """
+    def forward(message):
+        kind, payload = message
+        if kind == "texture":
+            on_texture(payload)
+        else:
+            logger(payload)
+
+    max_workers = min(len(jobs), os.cpu_count() or 1, ASSET_FILE_WORKERS)
+    # Spawned instead of forked, the GUI calls this from a process that already runs other threads
+    mp_context = multiprocessing.get_context("spawn")
+    with mp_context.Manager() as manager:
+        log_queue = manager.Queue()
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+            futures = [
+                executor.submit(_process_asset_file_in_subprocess, job, log_queue)
+                for job in jobs
+            ]
+            while not all(future.done() for future in futures):
+                try:
+                    forward(log_queue.get(timeout=0.1))
+                except queue.Empty:
+                    pass
+        # Messages logged right before the workers finished
+        while not log_queue.empty():
+            forward(log_queue.get())
+
+    results = []
+    for job, future in zip(jobs, futures):
+        try:
+            results.append(future.result())
         except Exception as e:
             warnings.warn(
-                f"[UNOFFICIAL RETRO PATCH] Failed to load asset file '{asset_file}': {e}"
+                f"[UNOFFICIAL RETRO PATCH] Failed to process asset file '{job[0]}': {e}"
             )
-            continue
-
-    return files_to_replace
+            results.append(None)
+    return results
 
 def replace_files(files_to_replace, logger=None):
     # Process all file replacements after the loop to ensure no asset files are being accessed
     logger(f"[UNOFFICIAL RETRO PATCH] Processing {len(files_to_replace)} file replacements...")
-    for original_file, temp_file in files_to_replace:
-        max_wait = 30  # seconds
-        wait_time = 0
-        while is_file_locked(original_file) and wait_time < max_wait:
-            logger(f"[UNOFFICIAL RETRO PATCH] File locked, waiting... ({wait_time}s)")
-            time.sleep(2)
-            wait_time += 2
-
-        if is_file_locked(original_file):
-            warnings.warn(f"File still locked after {max_wait}s: {original_file}")
-            continue
-
+    # Sorted, so files of the same directory are replaced one after another
+    for original_file, temp_file in sorted(files_to_replace):
+        backup_file = None
         try:
             # Create backup
-            backup_no = 1
+            backup_no = latest_backup_no(original_file) + 1
             backup_file = f"{original_file}.backup{backup_no:03}"
-            while os.path.exists(backup_file):
-                backup_no += 1
-                backup_file = f"{original_file}.backup{backup_no:03}"
 
             logger(f"[UNOFFICIAL RETRO PATCH] Creating backup: {original_file} -> {backup_file}")
-            os.rename(original_file, backup_file)
+            # Hard link the backup, so the original stays in place until it's atomically replaced
+            try:
+                os.link(original_file, backup_file)
+            except OSError:
+                # e.g. file systems without hard links
+                shutil.copy2(original_file, backup_file)
 
             logger(f"[UNOFFICIAL RETRO PATCH] Replacing original with modified file: {temp_file} -> {original_file}")
-            os.rename(temp_file, original_file)
+            replace_with_retry(temp_file, original_file, logger)
 
             logger(f"[UNOFFICIAL RETRO PATCH] Successfully replaced asset file: {original_file}")
         except Exception as e:
             warnings.warn(f"Failed to replace asset file '{original_file}': {e}")
-            # Try to restore original if backup was created
-            if os.path.exists(backup_file) and not os.path.exists(original_file):
-                try:
+            if backup_file is None or not os.path.exists(backup_file):
+                continue
+            try:
+                if os.path.exists(original_file):
+                    # The original is still in place (e.g. it stayed locked), so the backup isn't needed
+                    os.remove(backup_file)
+                else:
+                    # Try to restore original from the backup
                     os.rename(backup_file, original_file)
                     logger(f"[UNOFFICIAL RETRO PATCH] Restored original file from backup: {original_file}")
-                except Exception as restore_e:
-                    warnings.warn(f"Failed to restore original file '{original_file}': {restore_e}")
+            except Exception as restore_e:
+                warnings.warn(f"Failed to restore original file '{original_file}': {restore_e}")
 
 def main():
     print("\n[UNOFFICIAL RETRO PATCH] Starting pixelation process...")
@@ -1,27 +1,68 @@
 from PIL import Image
 import os
+import sys
+from functools import lru_cache
 import numpy as np
 
-def pixelate_image(image, resize_amount):
+
+# Lookup table turning an alpha band into a hard mask, every visible pixel (alpha > 0) becomes 255
+HARD_ALPHA_LUT = [0] + [255] * 255
+
+# Filters available to downscale images before they are scaled back up with NEAREST.
+# NEAREST keeps the original colors, BOX averages them (smoother, but blends edges)
+DOWNSAMPLE_FILTERS = {
+    "nearest": Image.Resampling.NEAREST,
+    "box": Image.Resampling.BOX,
+}
+
+def load_mask(mask_file):
+    """
+    Load a mask as grayscale image, decoded only once per process as long as the file doesn't change.
+
+    Args:
+        mask_file: Path to the mask file
+
+    Returns:
+        Cached PIL Image (L), callers have to copy it before modifying it
+    """
+    return _load_mask(mask_file, os.stat(mask_file).st_mtime_ns)
+
+
+# Masks are up to 8192x8192, so only a few of them are kept in memory
+@lru_cache(maxsize=4)
+def _load_mask(mask_file, mtime_ns):
+    return Image.open(mask_file).convert("L")
+
+
+def pixelate_image(image, resize_amount, downsample_filter="nearest"):
     """
     Apply pixelation effect to an image with the specified resize amount.
 
     Args:
         image: PIL Image object
         resize_amount: Float between 0 and 1, smaller values mean more pixelation
+        downsample_filter: Name of the filter used to downscale, see DOWNSAMPLE_FILTERS
 
     Returns:
         PIL Image with pixelation effect applied
     """
-    # Downscale the image
-    small_image = image.resize(
-        (
-            round(image.width * resize_amount),
-            round(image.height * resize_amount),
-        ),
-        Image.Resampling.NEAREST,
+    small_size = (
+        round(image.width * resize_amount),
+        round(image.height * resize_amount),
     )
+    # Nothing to pixelate, both resizes would return the same pixels
+    if small_size == image.size:
+        return image.copy()
+
+    # Downscale the image, NEAREST keeps the original colors
+    # (Image.reduce() would average them, blending sprite edges with transparent pixels).
+    # BOX only pays off for strong downscales, milder ones always use NEAREST
+    resample = DOWNSAMPLE_FILTERS[downsample_filter]
+    if resize_amount > 0.5:
+        resample = Image.Resampling.NEAREST
+    small_image = image.resize(small_size, resample)
     # Upscale back to original size
+    # (both resizes together are several times faster than a single NumPy index gather)
     return small_image.resize(
         (image.width, image.height),
         Image.Resampling.NEAREST,
@@ -45,18 +86,19 @@ def apply_black_shadows(image, shadow_color=(0, 0, 0, 255)):
     # Convert to numpy array for faster pixel operations
     img_array = np.array(image)
 
+    # View every RGBA pixel as a single uint32, so R, G and B are checked in one comparison
+    # and the shadow color is written with a single store per pixel
+    height, width = img_array.shape[:2]
+    pixels = img_array.view(np.uint32).reshape(height, width)
+    rgb_bits = np.uint32(0x00FFFFFF if sys.byteorder == "little" else 0xFFFFFF00)
+    alpha = img_array[:, :, 3]
+
     # Create boolean mask for pixels that should be replaced
     # Semi-transparent black pixels (shadow-like) (R=0, G=0, B=0, 127 < A < 255)
-    mask = (
-        (img_array[:, :, 0] == 0) &  # R = 0
-        (img_array[:, :, 1] == 0) &  # G = 0
-        (img_array[:, :, 2] == 0) &  # B = 0
-        (img_array[:, :, 3] > 127) &  # A > 127
-        (img_array[:, :, 3] < 255)  # A < 255
-    )
+    mask = ((pixels & rgb_bits) == 0) & (alpha > 127) & (alpha < 255)
 
     # Apply shadow color to masked pixels
-    img_array[mask] = shadow_color
+    pixels[mask] = np.frombuffer(bytes(shadow_color), dtype=np.uint32)[0]
 
     # Convert back to PIL Image
     return Image.fromarray(img_array, 'RGBA')
@@ -80,40 +122,69 @@ def apply_offset_correction(pixelated_image, resize_amount):
         return pixelated_image
 
     width, height = pixelated_image.size
-    result = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    # Every pixel is written below, so the image isn't zero-filled first
+    result = Image.new("RGBA", (width, height), None)
+
+    # Top and left edges are transparent
+    result.paste((0, 0, 0, 0), (0, 0, width, min(pixel_offset, height)))
+    result.paste((0, 0, 0, 0), (0, 0, min(pixel_offset, width), height))
 
     # Main image with offset
     result.paste(pixelated_image, (pixel_offset, pixel_offset))
 
-    # Fix right edge
-    right_strip = pixelated_image.crop((0, 0, 1, height))
-    for i in range(pixel_offset):
-        result.paste(right_strip, (width - 1 - i, pixel_offset))
+    # Fix right edge, the first column stretched to the offset width in a single paste
+    right_strip = pixelated_image.crop((0, 0, 1, height)).resize((pixel_offset, height), Image.Resampling.NEAREST)
+    result.paste(right_strip, (width - pixel_offset, pixel_offset))
 
-    # Fix bottom edge
-    bottom_strip = pixelated_image.crop((0, 0, width, 1))
-    for i in range(pixel_offset):
-        result.paste(bottom_strip, (pixel_offset, height - 1 - i))
+    # Fix bottom edge, the first row stretched to the offset height
+    bottom_strip = pixelated_image.crop((0, 0, width, 1)).resize((width, pixel_offset), Image.Resampling.NEAREST)
+    result.paste(bottom_strip, (pixel_offset, height - pixel_offset))
 
-    # Fix corner pixels
-    corner_pixel = pixelated_image.crop((0, 0, 1, 1))
-    for i in range(pixel_offset):
-        for j in range(pixel_offset):
-            result.paste(corner_pixel, (width - 1 - i, height - 1 - j))
+    # Fix corner pixels, filled with the color of the first pixel
+    result.paste(pixelated_image.getpixel((0, 0)), (width - pixel_offset, height - pixel_offset, width, height))
 
     return result
 
 
-def process_image(image, resize_amount, mask_file=None, asset_name=None, black_shadows=False):
+def quantize_image(image, colors):
+    """
+    Reduce the colors of an image to a palette, for a more retro look.
+
+    Only the color channels are quantized, the alpha channel is kept as is.
+
+    Args:
+        image: PIL Image object (RGBA)
+        colors: Number of colors of the palette (at most 256)
+
+    Returns:
+        PIL Image (RGBA) with at most the given number of colors
+    """
+    quantized = image.convert("RGB").quantize(colors=colors, dither=Image.Dither.NONE)
+    quantized = quantized.convert("RGB")
+    quantized.putalpha(image.getchannel("A"))
+    return quantized
+
+
+def process_image(
+    image,
+    resize_amount,
+    mask_file=None,
+    asset_name=None,
+    black_shadows=False,
+    quantize_colors=0,
+    downsample_filter="nearest",
+):
     """
     Process an image with pixelation, offset correction, optional masking, and black shadows.
 
     Args:
         image: PIL Image object (RGBA)
         resize_amount: Float between 0 and 1
-        mask_file: Path to mask file or None
+        mask_file: Path to an existing mask file, or None to use the alpha channel as mask
         asset_name: Name of the asset (for logging)
         black_shadows: Boolean to enable black shadows feature
+        quantize_colors: Number of colors to reduce the pixelated image to, 0 to keep all colors
+        downsample_filter: Name of the filter used to downscale, see DOWNSAMPLE_FILTERS
 
     Returns:
         Processed PIL Image
@@ -122,12 +193,24 @@ def process_image(image, resize_amount, mask_file=None, asset_name=None, black_s
 
     file_name = asset_name or os.path.basename(mask_file)
 
-    # Extract alpha mask
-    alpha_mask = image.split()[-1].convert("L")
-    hard_alpha_mask = alpha_mask.point(lambda p: 255 if p > 0 else 0)
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+
+    # Extract alpha mask, only the alpha band is copied instead of splitting all bands
+    alpha_mask = image.getchannel("A")
+    hard_alpha_mask = alpha_mask.point(HARD_ALPHA_LUT)
+
+    # Only visible pixels are pixelated, skip the work if there are none
+    min_alpha, max_alpha = hard_alpha_mask.getextrema()
+    if max_alpha == 0:
+        if asset_name:
+            print(f"[UNOFFICIAL RETRO PATCH] {file_name} is fully transparent, nothing to pixelate")
+        return image
+    # If every pixel is visible, the composite would take every pixel from the pixelated image
+    fully_visible = min_alpha == 255
 
     # Apply pixelation
-    pixelated = pixelate_image(image, resize_amount)
+    pixelated = pixelate_image(image, resize_amount, downsample_filter)
 
     # Apply black shadows if enabled
     if black_shadows:
@@ -135,32 +218,49 @@ def process_image(image, resize_amount, mask_file=None, asset_name=None, black_s
         if asset_name:
             print(f"[UNOFFICIAL RETRO PATCH] Applied black shadows to {file_name}")
 
+    # Reduce colors if enabled, after black shadows so those still find the original shadow pixels
+    if quantize_colors:
+        pixelated = quantize_image(pixelated, quantize_colors)
+        if asset_name:
+            print(f"[UNOFFICIAL RETRO PATCH] Reduced {file_name} to {quantize_colors} colors")
+
     # Apply offset correction
     # Doesn't work well as of now, so it's commented out
     # corrected = apply_offset_correction(pixelated, resize_amount)
 
-    # Apply mask if it exists, otherwise generate from alpha
-    if mask_file and os.path.exists(mask_file):
-        custom_mask = Image.open(mask_file).convert("L")
+    # Apply mask if it exists, otherwise generate from alpha.
+    # Image.composite already blends with 8-bit integer math in C, a NumPy uint16 lerp
+    # gives the same result but is several times slower (conversions to and from arrays)
+    if mask_file:
+        custom_mask = load_mask(mask_file).copy()
         custom_mask.paste(hard_alpha_mask, (0, 0)) # Paste the original hard alpha mask
-        final_image = Image.composite(pixelated, image, custom_mask)
+        if fully_visible and custom_mask.size == image.size:
+            final_image = pixelated
+        else:
+            final_image = Image.composite(pixelated, image, custom_mask)
         print(
             f"[UNOFFICIAL RETRO PATCH] Pixelates {file_name} with mask..."
         )
     else:
         # Use the alpha channel as a smooth mask for blending
-        final_image = Image.composite(pixelated, image, hard_alpha_mask)
+        if fully_visible:
+            final_image = pixelated
+        else:
+            final_image = Image.composite(pixelated, image, hard_alpha_mask)
         if asset_name:
             warnings.warn(f"[UNOFFICIAL RETRO PATCH] Pixelates {file_name} without custom mask, using alpha channel as mask.")
 
     # If black shadows are enabled, we want to have the pixelated shadow areas, so we can't simply use the alpha mask
     if black_shadows:
         # Restore original alpha
-        pixelated_mask = pixelated.split()[-1].convert("L")
+        pixelated_mask = pixelated.getchannel("A")
 
         # combine the alpha mask with the pixelated mask, ensuring the alpha mask uses pixelated mask,
         # this will pixelate the shadow areas
-        alpha_mask = Image.composite(pixelated_mask, alpha_mask, hard_alpha_mask)
+        if fully_visible:
+            alpha_mask = pixelated_mask
+        else:
+            alpha_mask = Image.composite(pixelated_mask, alpha_mask, hard_alpha_mask)
 
     final_image.putalpha(alpha_mask)
 
@@ -1,37 +1,109 @@
 # Source: https://github.com/K0lb3/UnityPy/blob/master/UnityPy/export/Texture2DConverter.py
+import hashlib
+import threading
 import warnings
+from collections import OrderedDict
 
 from UnityPy.enums import TextureFormat
 
 TF = TextureFormat
 
+# Maximum total size of the compressed textures kept by compress_etcpak_cached, BC7 textures can be 64 MB each
+COMPRESS_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Compressed textures by (digest, width, height, format), least recently used first
+_compress_cache = OrderedDict()
+_compress_cache_bytes = 0
+_compress_cache_lock = threading.Lock()
+
+
+def compress_etcpak_cached(
+    data: bytes, width: int, height: int, target_texture_format: TextureFormat
+) -> bytes:
+    """
+    compress_etcpak, reusing the result for identical texture data.
+
+    Hashing is far faster than BC7 compression, so identical textures (e.g. duplicated sprite sheets
+    in one asset file) aren't compressed again. The cache is cleared with clear_compress_cache()
+    once an asset file is done, so it doesn't keep memory for the lifetime of the process.
+    """
+    global _compress_cache_bytes
+
+    key = (
+        hashlib.blake2b(data, digest_size=16).digest(),
+        width,
+        height,
+        target_texture_format,
+    )
+    with _compress_cache_lock:
+        compressed = _compress_cache.get(key)
+        if compressed is not None:
+            _compress_cache.move_to_end(key)
+            return compressed
+
+    compressed = compress_etcpak(data, width, height, target_texture_format)
+
+    with _compress_cache_lock:
+        if key not in _compress_cache and len(compressed) <= COMPRESS_CACHE_MAX_BYTES:
+            _compress_cache[key] = compressed
+            _compress_cache_bytes += len(compressed)
+            while _compress_cache_bytes > COMPRESS_CACHE_MAX_BYTES:
+                _, evicted = _compress_cache.popitem(last=False)
+                _compress_cache_bytes -= len(evicted)
+    return compressed
+
+
+# etcpak compress function for each texture format
+ETCPAK_COMPRESS_FUNCTIONS = {
+    TF.DXT1: "compress_bc1",
+    TF.DXT1Crunched: "compress_bc1",
+    TF.DXT5: "compress_bc3",
+    TF.DXT5Crunched: "compress_bc3",
+    TF.BC4: "compress_bc4",
+    TF.BC5: "compress_bc5",
+    # Modified call to compress_bc7, not passing 'None' as the second argument as it does not accept it
+    TF.BC7: "compress_bc7",
+    TF.ETC_RGB4: "compress_etc1_rgb",
+    TF.ETC_RGB4Crunched: "compress_etc1_rgb",
+    TF.ETC_RGB4_3DS: "compress_etc1_rgb",
+    TF.ETC2_RGB: "compress_etc2_rgb",
+    TF.ETC2_RGBA8: "compress_etc2_rgba",
+    TF.ETC2_RGBA8Crunched: "compress_etc2_rgba",
+    TF.ETC2_RGBA1: "compress_etc2_rgba",
+}
+
+# ETCPAK_COMPRESS_FUNCTIONS resolved to the etcpak functions, on first use
+_etcpak_compressors = None
+
+
+def clear_compress_cache():
+    """Drop all textures cached by compress_etcpak_cached."""
+    global _compress_cache_bytes
+
+    with _compress_cache_lock:
+        _compress_cache.clear()
+        _compress_cache_bytes = 0
+
 
 def compress_etcpak(
     data: bytes, width: int, height: int, target_texture_format: TextureFormat
 ) -> bytes:
-    import etcpak  # etcpak is imported locally in the original function
-
-    if target_texture_format in [TF.DXT1, TF.DXT1Crunched]:
-        return etcpak.compress_bc1(data, width, height)
-    elif target_texture_format in [TF.DXT5, TF.DXT5Crunched]:
-        return etcpak.compress_bc3(data, width, height)
-    elif target_texture_format == TF.BC4:
-        return etcpak.compress_bc4(data, width, height)
-    elif target_texture_format == TF.BC5:
-        return etcpak.compress_bc5(data, width, height)
-    elif target_texture_format == TF.BC7:
-        # Modified call to compress_bc7, not passing 'None' as the second argument as it does not accept it
-        return etcpak.compress_bc7(data, width, height)
-    elif target_texture_format in [TF.ETC_RGB4, TF.ETC_RGB4Crunched, TF.ETC_RGB4_3DS]:
-        return etcpak.compress_etc1_rgb(data, width, height)
-    elif target_texture_format == TF.ETC2_RGB:
-        return etcpak.compress_etc2_rgb(data, width, height)
-    elif target_texture_format in [TF.ETC2_RGBA8, TF.ETC2_RGBA8Crunched, TF.ETC2_RGBA1]:
-        return etcpak.compress_etc2_rgba(data, width, height)
-    else:
+    global _etcpak_compressors
+
+    if _etcpak_compressors is None:
+        import etcpak  # etcpak is imported locally in the original function
+
+        _etcpak_compressors = {
+            texture_format: getattr(etcpak, name)
+            for texture_format, name in ETCPAK_COMPRESS_FUNCTIONS.items()
+        }
+
+    compress = _etcpak_compressors.get(target_texture_format)
+    if compress is None:
         raise NotImplementedError(
             f"etcpak has no compress function for {target_texture_format.name}"
         )
+    return compress(data, width, height)
 
 
 def patch_unitypy():
@@ -41,7 +113,7 @@ def patch_unitypy():
     try:
         from UnityPy.export import Texture2DConverter
 
-        Texture2DConverter.compress_etcpak = compress_etcpak
+        Texture2DConverter.compress_etcpak = compress_etcpak_cached
         print("[UNOFFICIAL RETRO PATCH] Successfully monkey patched compress_etcpak.")
     except (AttributeError, ImportError) as e:
         warnings.warn(